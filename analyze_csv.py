@@ -4,23 +4,20 @@ from datetime import datetime
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.utils import ImageReader
-from datetime import timedelta
 import matplotlib.pyplot as plt
-import json
+import numpy as np
 from weekly_report import generate_weekly_report
 from radar_chart import plot_radar_chart
+from dashboard_feed import write_dashboard_feed
+from image_output import save_figure, output_paths
+from chart_config import resolve_user_style, chart_style
+from state_journal import record_changes
+from report_queue import run_report_jobs
+from habit_bits import build_habit_bits, habit_mask, streak_from_bits, habit_averages as bit_habit_averages, save_habit_bits, load_habit_bits
 
 CSV_PATH = "form_data/growth_data.csv"
-
-# ===== SAFE CHECK =====
-if not os.path.exists(CSV_PATH):
-    print("❌ CSV file not found")
-    exit()
-
-if os.path.getsize(CSV_PATH) == 0:
-    print("❌ CSV file is empty")
-    exit()
-# ======================
+# Optional limit (seconds) on the per-user report loop; unfinished users are picked up next run
+REPORT_TIME_BUDGET = float(os.environ['REPORT_TIME_BUDGET']) if os.environ.get('REPORT_TIME_BUDGET') else None
 
 def validate_and_clean_data(df):
     # Check for duplicates based on timestamp and username
@@ -84,73 +81,14 @@ def load_and_normalize_csv(path):
         print(f"❌ Error loading CSV: {e}")
         return pd.DataFrame()
 
-def collapse_to_daily(df):
-    """Collapse multiple submissions on the same date to a single daily row (max of each habit)."""
-    df['date'] = pd.to_datetime(df['timestamp']).dt.date
-    habit_cols = ['physics','additional_subject_chemistrymaths','exercise','wake_up','screen_control']
-    daily = (
-        df.groupby(['username','date'])[habit_cols]
-        .max()        .reset_index()
-    )
-    return daily
-
-def compute_streak_for_user(daily_df, required_cols, start_date_obj, end_date_obj, mercy_days=2):
+def save_streak_state(streak_state, path='streaks_state.json'):
     """
-    Compute streak for one user using:
-      - required_cols: list of columns that must be True on a day to count as a valid day
-      - mercy_days: allowed consecutive missing days (no submissions) tolerated
-    Rules:
-      - A logged day with required_cols not all True breaks the streak immediately.
-      - Missing days (no row) are tolerated up to mercy_days in a row.
-      - If last_log is older than mercy_days relative to end_date_obj, return 0 (no visible streak).
+    Append the users whose streaks changed to the state journal
+    (streaks_state.json.journal); see state_journal.py for replay/compaction.
     """
-    if daily_df.empty:
-        return 0
-    
-    # Map date -> row
-    daily_df = daily_df.sort_values('date')
-    daily_df['valid_day'] = daily_df[required_cols].all(axis=1)
-
-    logged_dates = set(daily_df['date'].tolist())
-    valid_dates = set(daily_df[daily_df['valid_day']]['date'].tolist())
-
-    last_log = daily_df['date'].max()
-
-    # If user hasn't logged within mercy_days of end, they show no active streak
-    if (end_date_obj - last_log).days > mercy_days:
-        return 0
-
-    # Walk backwards from last_log day-by-day and count streak
-    streak = 0
-    missing_in_a_row = 0
-    cur_date = last_log
-
-    while cur_date >= start_date_obj:
-        if cur_date in logged_dates:
-            if cur_date in valid_dates:
-                streak += 1
-                missing_in_a_row = 0
-            else:
-                # Logged but invalid -> break streak
-                break
-        else:
-            missing_in_a_row += 1
-            if missing_in_a_row > mercy_days:
-                break
-        cur_date -= timedelta(days=1)
-    
-    return streak
-
-def save_streak_state(streak_state, path='streaks_state.json'):
     try:
-        if os.path.exists(path):
-            with open(path, 'r') as f:
-                existing = json.load(f)
-            existing.update(streak_state)
-            streak_state = existing
-        with open(path, 'w') as f:
-            json.dump(streak_state, f, indent=4)
-        print(f"✅ Streak state saved to {path}")
+        changed = record_changes(path, streak_state, ignore_keys=('saved_on',))
+        print(f"✅ Streak state saved to {path} ({len(changed)} users changed)")
     except Exception as e:
         print(f"❌ Error saving streak state: {e}")
 
@@ -220,13 +158,15 @@ def calculate_mental_streak(group):
 
 # --------------------------- Helper: persist streak state (duplicate removed) ---------------------------
 
-def generate_user_summaries(df):
+def generate_user_summaries(df, users=None):
     """
     Updated user summaries generator that:
       - uses a fixed competition start date
       - collapses logs to one row per user/day
       - computes three streak types with mercy for missing days
       - persists streak state to 'streaks_state.json'
+      - with `users`, only summarizes those users (the competition window
+        still comes from the full data), for incremental recomputation
 
     NOTE: This version fixes a KeyError when the grouped DataFrame does not contain
     the 'username' column (pandas may move the group key to group.name).
@@ -260,19 +200,29 @@ def generate_user_summaries(df):
     print(f"   Latest Data Point: {end_date_obj}")
     print(f"   Total Days Counted: {total_competition_days}")
 
-    # 4) Collapse original logs into one row per user/day for streak evaluation
-    daily_all = collapse_to_daily(df)
+    if users is not None:
+        df = df[df['username'].isin(users)].copy()
+        if df.empty:
+            return pd.DataFrame()
+
+    # 4) Pack logs into one bitmask per user/day for streak evaluation
+    bit_users, habit_bits = build_habit_bits(df, start_date_obj, end_date_obj)
+    bit_rows = {u: i for i, u in enumerate(bit_users)}
+    no_logs = np.zeros(habit_bits.shape[1], dtype=np.uint8)
+    academic_mask = habit_mask(['physics', 'additional_subject_chemistrymaths'])
+    physical_mask = habit_mask(['exercise'])
+    mental_mask = habit_mask(['wake_up', 'screen_control'])
 
     # 5) Summarize per user (note: `group` might not include 'username' column)
     def summarize_group(group):
         total_score = group['daily_score'].sum()
         average_score = total_score / total_competition_days
         
-        # Compute streaks using daily data
-        user_daily = daily_all[daily_all['username'] == group.name]
-        academic_streak = compute_streak_for_user(user_daily, ['physics', 'additional_subject_chemistrymaths'], start_date_obj, end_date_obj, MERCY_DAYS)
-        physical_streak = compute_streak_for_user(user_daily, ['exercise'], start_date_obj, end_date_obj, MERCY_DAYS)
-        mental_streak = compute_streak_for_user(user_daily, ['wake_up', 'screen_control'], start_date_obj, end_date_obj, MERCY_DAYS)
+        # Compute streaks from the user's packed daily history
+        user_days = habit_bits[bit_rows[group.name]] if group.name in bit_rows else no_logs
+        academic_streak = streak_from_bits(user_days, academic_mask, MERCY_DAYS)
+        physical_streak = streak_from_bits(user_days, physical_mask, MERCY_DAYS)
+        mental_streak = streak_from_bits(user_days, mental_mask, MERCY_DAYS)
         
         days_logged = len(group)
         
@@ -304,6 +254,8 @@ def generate_user_summaries(df):
             'saved_on': str(datetime.now().date())
         }
     save_streak_state(streak_state, path=STREAK_STATE_PATH)
+    # Incremental runs only carry some users, so merge them into the stored history
+    save_habit_bits(bit_users, habit_bits, start_date_obj, merge=users is not None)
 
     return summaries
 
@@ -312,18 +264,11 @@ def plot_individual_trends(df, username):
     if user_df.empty:
         return None
     
-    try:
-        with open('user_config.json', 'r') as f:
-            user_config = json.load(f)
-        config = user_config.get(username, {})
-        title = config.get('title', f'Daily Score Trends for {username}')
-        color = config.get('color', 'blue')
-    except FileNotFoundError:
-        title = f'Daily Score Trends for {username}'
-        color = 'blue'
+    # Parsed once per run (and again only if the file changes), see chart_config.py
+    title, color = resolve_user_style(username)
     
     fig, ax = plt.subplots()
-    ax.plot(user_df['timestamp'], user_df['daily_score'], marker='o', color=color)
+    ax.plot(user_df['timestamp'], user_df['daily_score'], marker=chart_style('trend_marker'), color=color)
     ax.set_xlabel('Date')
     ax.set_ylabel('Daily Score')
     ax.set_title(title)
@@ -331,7 +276,7 @@ def plot_individual_trends(df, username):
     plt.tight_layout()
     os.makedirs('data/individual_images', exist_ok=True)
     filename = f'data/individual_images/{username}_trends.png'
-    plt.savefig(filename)
+    save_figure(fig, filename, for_pdf=True)
     plt.close()
     return filename
 
@@ -373,13 +318,7 @@ def generate_individual_report(df, username, summaries):
     c.save()
     print(f"✅ Individual report saved as {pdf_file}")
 
-# Main execution
-df = load_and_normalize_csv(CSV_PATH)
-df = validate_and_clean_data(df)
-df = map_habit_values(df)
-df = calculate_daily_scores(df)
-
-def generate_individual_report(df, username, summaries):
+def generate_individual_report(df, username, summaries, habit_history=None):
     user_summary = summaries.loc[username]
     user_df = df[df['username'] == username]
     
@@ -390,7 +329,12 @@ def generate_individual_report(df, username, summaries):
     
     # Generate radar chart for habits
     habit_cols = ['physics', 'additional_subject_chemistrymaths', 'exercise', 'wake_up', 'screen_control']
-    habit_averages = user_df[habit_cols].mean()
+    if habit_history is not None and username in habit_history[0]:
+        # Per-day averages straight from the packed history (see habit_bits.py)
+        history_users, history_bits, _ = habit_history
+        habit_averages = bit_habit_averages(history_bits[np.flatnonzero(history_users == username)[0]])
+    else:
+        habit_averages = user_df[habit_cols].mean()
     radar_file = plot_radar_chart(habit_averages, username)
     
     # Create PDF
@@ -429,28 +373,65 @@ def generate_individual_report(df, username, summaries):
     
     c.save()
     print(f"✅ Individual report saved as {pdf_file}")
+    # Every file the report produced, so the job queue can tell when one goes missing
+    chart_files = output_paths(trend_file, for_pdf=True) + (output_paths(radar_file, for_pdf=True) if radar_file else [])
+    return [pdf_file] + chart_files
+
+def prepare_dataframe(path=CSV_PATH):
+    """Load, clean, map and score the CSV (the shared first half of every run)."""
+    df = load_and_normalize_csv(path)
+    if df.empty:
+        return df
+    df = validate_and_clean_data(df)
+    df = map_habit_values(df)
+    df = calculate_daily_scores(df)
+    return df
+
+# Main execution (guarded so worker processes can import this module)
+if __name__ == "__main__":
+    # ===== SAFE CHECK =====
+    if not os.path.exists(CSV_PATH):
+        print("❌ CSV file not found")
+        exit()
+
+    if os.path.getsize(CSV_PATH) == 0:
+        print("❌ CSV file is empty")
+        exit()
+    # ======================
+
+    df = prepare_dataframe(CSV_PATH)
 
-print("\nNormalized data:")
-print(df.head())
+    print("\nNormalized data:")
+    print(df.head())
 
-print("\nActual columns:")
-print(df.columns.tolist())
+    print("\nActual columns:")
+    print(df.columns.tolist())
 
-print("\nDaily scores:")
-print(df[["timestamp", "username", "daily_score"]].head())
+    print("\nDaily scores:")
+    print(df[["timestamp", "username", "daily_score"]].head())
 
-print("\n🏆 User Summaries:")
-summaries = generate_user_summaries(df)
-print(summaries)
+    print("\n🏆 User Summaries:")
+    summaries = generate_user_summaries(df)
+    print(summaries)
 
-# Generate one PDF per user (individual growth tracking)
-users = df['username'].unique()
-for user in users:
-    if user in summaries.index:
-        generate_individual_report(df, user, summaries)
+    # Precomputed JSON for the website dashboard
+    write_dashboard_feed(df, summaries)
 
-print("✅ All individual PDFs generated")
+    # Generate one PDF per user (individual growth tracking), freshest submitters first,
+    # resuming from data/.report_checkpoint.json if a previous run stopped part way
+    habit_history = load_habit_bits()
+    result = run_report_jobs(
+        df, summaries,
+        lambda user: generate_individual_report(df, user, summaries, habit_history),
+        time_budget=REPORT_TIME_BUDGET
+    )
+
+    if result['failed'] or result['remaining']:
+        print(f"⚠️ Individual PDFs incomplete: {len(result['failed'])} failed, "
+              f"{len(result['remaining'])} deferred to the next run")
+    else:
+        print("✅ All individual PDFs generated")
 
-# Generate weekly report
-generate_weekly_report()
+    # Generate weekly report
+    generate_weekly_report()
 
@@ -0,0 +1,174 @@
+import os
+import json
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import pandas as pd
+
+MANIFEST_PATH = "data/.artifact_manifest.json"
+
+class Artifact:
+    """
+    One node of the report graph.
+      - func is called as func(*args, *dep_results, **kwargs)
+      - deps are names of other artifacts whose results are passed in
+      - nodes that write files return the list of paths they wrote; nodes
+        that only compute a value (e.g. the league) are run on demand
+      - version is any extra setting that changes the output (e.g. image profiles)
+    """
+    def __init__(self, name, func, args=(), kwargs=None, deps=(), writes_files=True, version=None):
+        self.name = name
+        self.version = version
+        self.func = func
+        self.args = tuple(args)
+        self.kwargs = kwargs or {}
+        self.deps = tuple(deps)
+        self.writes_files = writes_files
+
+def _fingerprint_value(value, digest):
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr(list(value.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        digest.update(repr(value.name).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    else:
+        digest.update(repr(value).encode())
+
+def _fingerprint(node, dep_fingerprints):
+    digest = hashlib.sha256()
+    digest.update(f"{node.func.__module__}.{node.func.__qualname__}".encode())
+    for value in node.args:
+        _fingerprint_value(value, digest)
+    _fingerprint_value(sorted(node.kwargs.items()), digest)
+    _fingerprint_value(node.version, digest)
+    for dep in node.deps:
+        digest.update(dep_fingerprints[dep].encode())
+    return digest.hexdigest()
+
+def _topological_order(nodes):
+    order, state = [], {}
+    def visit(name):
+        if state.get(name) == 'done':
+            return
+        if state.get(name) == 'visiting':
+            raise ValueError(f"Artifact graph has a cycle at '{name}'")
+        state[name] = 'visiting'
+        for dep in nodes[name].deps:
+            if dep not in nodes:
+                raise ValueError(f"Artifact '{name}' depends on unknown artifact '{dep}'")
+            visit(dep)
+        state[name] = 'done'
+        order.append(name)
+    for name in nodes:
+        visit(name)
+    return order
+
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=4)
+    os.replace(tmp_path, path)
+
+def _timed_call(func, args, kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def run_artifacts(artifacts, max_workers=None, force=False, manifest_path=MANIFEST_PATH):
+    """
+    Run the artifact graph, executing independent nodes concurrently.
+
+    File-writing artifacts whose fingerprint (function + inputs + upstream
+    fingerprints) matches the previous run and whose files still exist are
+    skipped; value nodes only run when something downstream needs them.
+    When a node reruns, files it wrote last time but not this time (e.g. a
+    page that no longer exists) are deleted.
+    Returns {name: {'status', 'seconds', 'outputs'}}.
+    """
+    nodes = {a.name: a for a in artifacts}
+    order = _topological_order(nodes)
+    manifest = load_manifest(manifest_path)
+
+    fingerprints = {}
+    for name in order:
+        fingerprints[name] = _fingerprint(nodes[name], fingerprints)
+
+    # Decide what must run: stale file nodes, then everything upstream of them,
+    # since a node gets its inputs from its dependencies' results in this run
+    needed = set()
+    for name in order:
+        node = nodes[name]
+        previous = manifest.get(name, {})
+        if node.writes_files and (force or not (
+            previous.get('fingerprint') == fingerprints[name]
+            and all(os.path.exists(p) for p in previous.get('outputs', []))
+        )):
+            needed.add(name)
+    for name in reversed(order):
+        if name in needed:
+            needed.update(nodes[name].deps)
+
+    report = {
+        name: {'status': 'skipped', 'seconds': 0.0, 'outputs': manifest.get(name, {}).get('outputs', [])}
+        for name in order if name not in needed
+    }
+    results = {}
+    pending = [name for name in order if name in needed]
+
+    def submit(executor, name):
+        node = nodes[name]
+        args = node.args + tuple(results[dep] for dep in node.deps)
+        if executor is None:
+            return _timed_call(node.func, args, node.kwargs)
+        return executor.submit(_timed_call, node.func, args, node.kwargs)
+
+    def finish(name, result, seconds):
+        results[name] = result
+        outputs = list(result or []) if nodes[name].writes_files else []
+        report[name] = {'status': 'ran', 'seconds': seconds, 'outputs': outputs}
+        if nodes[name].writes_files:
+            for path in set(manifest.get(name, {}).get('outputs', [])) - set(outputs):
+                # Left over from the previous run, e.g. facet pages after switching back to one chart
+                if os.path.exists(path):
+                    os.remove(path)
+            manifest[name] = {'fingerprint': fingerprints[name], 'outputs': outputs}
+
+    workers = min(max_workers or os.cpu_count() or 1, max(len(pending), 1))
+    try:
+        if workers == 1:
+            # Sequential fallback: single core, one node to run, or max_workers=1 for debugging
+            for name in pending:
+                finish(name, *submit(None, name))
+        elif pending:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                running = {}
+                while pending or running:
+                    for name in [n for n in pending if all(d in results for d in nodes[n].deps)]:
+                        pending.remove(name)
+                        running[submit(executor, name)] = name
+                    if not running:
+                        raise RuntimeError(f"Artifacts {pending} are waiting on results that were never produced")
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        finish(running.pop(future), *future.result())
+    finally:
+        # Keep the fingerprints of everything that finished, even if a node failed
+        save_manifest(manifest, manifest_path)
+    return {name: report[name] for name in order if name in report}
+
+def print_artifact_report(report):
+    print("\n⏱️ Artifact timings:")
+    for name, info in report.items():
+        if info['status'] == 'skipped':
+            print(f"   {name:<24} skipped (unchanged)")
+        else:
+            print(f"   {name:<24} {info['seconds']:.2f}s")
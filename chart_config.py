@@ -0,0 +1,151 @@
+import os
+import json
+from numbers import Real
+import matplotlib
+from matplotlib.colors import is_color_like
+from matplotlib.markers import MarkerStyle
+
+USER_CONFIG_PATH = 'user_config.json'
+DEFAULT_USER_COLOR = 'blue'
+CHARTS_KEY = '_charts'   # optional section of user_config.json overriding CHART_STYLE
+
+# Chart styling shared by the plotting modules; any key can be overridden in
+# user_config.json, e.g. {"_charts": {"heatmap_cmap": "magma"}}
+CHART_STYLE = {
+    'trend_marker': 'o',
+    'bar_figsize': [6.4, 4.8],
+    'bar_color': 'C0',
+    'table_figsize': [10, 6],
+    'table_fontsize': 10,
+    'weekly_figsize': [10, 6],
+    'polar_figsize': [8, 8],
+    'line_linewidth': 2,
+    'point_size': 20,
+    'topk_background_color': 'lightgray',
+    'topk_background_linewidth': 1,
+    'topk_background_alpha': 0.5,
+    'band_color': 'gray',
+    'band_alpha': 0.2,
+    'median_color': 'black',
+    'median_linewidth': 1.5,
+    'facet_panel_figsize': [3.2, 2.8],   # per panel; the figure grows with the grid
+    'facet_marker_size': 3,
+    'heatmap_cmap': 'viridis',
+    'heatmap_missing_color': '#eeeeee',
+    'heatmap_width': 12,
+    'heatmap_separator_linewidth': 1.5,
+    'radar_figsize': [6, 6],
+    'radar_fill_color': 'b',
+    'radar_fill_alpha': 0.25,
+    'radar_linewidth': 2,
+}
+
+def _is_number(value):
+    return isinstance(value, Real) and not isinstance(value, bool)
+
+def _is_marker(value):
+    try:
+        MarkerStyle(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+def _valid_style(key, value):
+    """Whether value is usable for chart style key, judged by the kind of setting."""
+    if key.endswith('_color'):
+        return is_color_like(value)
+    if key.endswith('_cmap'):
+        return isinstance(value, str) and value in matplotlib.colormaps
+    if key.endswith('_figsize'):
+        return (
+            isinstance(value, (list, tuple)) and len(value) == 2
+            and all(_is_number(v) and v > 0 for v in value)
+        )
+    if key.endswith('_alpha'):
+        return _is_number(value) and 0 <= value <= 1
+    if key.endswith('_linewidth'):
+        return _is_number(value) and value >= 0
+    if key.endswith(('_size', '_width', '_fontsize')):
+        return _is_number(value) and value > 0
+    if key.endswith('_marker'):
+        return _is_marker(value)
+    return True
+
+_cache = {'path': None, 'mtime': None, 'users': {}, 'charts': dict(CHART_STYLE)}
+
+def _validate_charts(overrides, path):
+    charts = dict(CHART_STYLE)
+    if not isinstance(overrides, dict):
+        print(f"⚠️ Ignoring '{CHARTS_KEY}' in {path}: expected an object")
+        return charts
+    for key, value in overrides.items():
+        if key not in CHART_STYLE:
+            print(f"⚠️ Unknown chart style '{key}' in {path}")
+        elif not _valid_style(key, value):
+            print(f"⚠️ Invalid value {value!r} for chart style '{key}' in {path}, using default")
+        else:
+            charts[key] = value
+    return charts
+
+def _validate_users(raw, path):
+    users = {}
+    for username, entry in raw.items():
+        if username == CHARTS_KEY:
+            continue
+        if not isinstance(entry, dict):
+            print(f"⚠️ Ignoring entry for {username} in {path}: expected an object")
+            continue
+        title = entry.get('title')
+        color = entry.get('color')
+        if title is not None and not isinstance(title, str):
+            print(f"⚠️ Invalid title for {username} in {path}, using default")
+            title = None
+        if color is not None and not is_color_like(color):
+            print(f"⚠️ Invalid color {color!r} for {username} in {path}, using default")
+            color = None
+        users[username] = (title, color)
+    return users
+
+def load_user_config(path=USER_CONFIG_PATH):
+    """
+    Parse and validate user_config.json into a per-user (title, color) lookup
+    plus chart styles. The result is cached and only re-read when the file's
+    mtime changes, so a batch run parses it once and the daemon picks up edits.
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+    if _cache['path'] == path and _cache['mtime'] == mtime:
+        return _cache
+
+    raw = {}
+    if mtime is not None:
+        try:
+            with open(path, 'r') as f:
+                raw = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ Ignoring {path}: {e}")
+        if not isinstance(raw, dict):
+            print(f"⚠️ Ignoring {path}: expected an object keyed by username")
+            raw = {}
+
+    _cache.update(
+        path=path,
+        mtime=mtime,
+        users=_validate_users(raw, path),
+        charts=_validate_charts(raw.get(CHARTS_KEY, {}), path),
+    )
+    return _cache
+
+def resolve_user_style(username, path=USER_CONFIG_PATH):
+    """(title, color) for a user's trend chart, falling back to the defaults."""
+    title, color = load_user_config(path)['users'].get(username, (None, None))
+    return title or f'Daily Score Trends for {username}', color or DEFAULT_USER_COLOR
+
+def user_color(username, path=USER_CONFIG_PATH):
+    """The user's configured color, or None when they have none."""
+    return load_user_config(path)['users'].get(username, (None, None))[1]
+
+def chart_style(key, path=USER_CONFIG_PATH):
+    return load_user_config(path)['charts'][key]
@@ -0,0 +1,134 @@
+import os
+import re
+import json
+import hashlib
+from datetime import datetime
+
+FEED_DIR = "website/feed"
+HASH_LENGTH = 12   # hex chars of sha256 in each filename; server.js marks these as immutable
+HABIT_COLS = ['physics', 'additional_subject_chemistrymaths', 'exercise', 'wake_up', 'screen_control']
+STREAK_COLS = ['academic_streak', 'physical_streak', 'mental_streak']
+
+def _compact_json(payload):
+    return json.dumps(payload, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+def _atomic_write(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _write_hashed(out_dir, name, payload):
+    """
+    Write payload as <name>.<hash>.json. The file is only written if that
+    exact content is not already on disk. Returns (relative path, written).
+    """
+    data = _compact_json(payload)
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    rel_path = f"{name}.{digest}.json"
+    path = os.path.join(out_dir, rel_path)
+    if os.path.exists(path):
+        return rel_path, False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _atomic_write(path, data)
+    return rel_path, True
+
+def _safe_name(username):
+    return re.sub(r'[^a-z0-9_-]', '_', str(username).lower())
+
+def _summary_record(row):
+    record = {
+        'total_score': float(row['total_score']),
+        'average_score': float(row['average_score']),
+        'days_logged': int(row['days_logged']),
+    }
+    for col in STREAK_COLS:
+        record[col] = int(row[col])
+    return record
+
+def _daily_series(df):
+    """One row per user/day: summed score and max of each habit."""
+    daily = (
+        df.assign(date=df['timestamp'].dt.strftime('%Y-%m-%d'))
+          .groupby(['username', 'date'], sort=True)
+          .agg(score=('daily_score', 'sum'), **{col: (col, 'max') for col in HABIT_COLS})
+    )
+    series = {}
+    for username, group in daily.groupby(level='username', sort=False):
+        dates = group.index.get_level_values('date')
+        series[username] = {
+            'dates': list(dates),
+            'score': group['score'].round(2).tolist(),
+            'habits': {col: group[col].astype(int).tolist() for col in HABIT_COLS},
+        }
+    return series
+
+def _manifest_paths(manifest):
+    return {manifest.get('league'), manifest.get('streaks'), *manifest.get('users', {}).values()} - {None}
+
+def _remove_stale(out_dir, keep):
+    # Hashed files that neither the current nor the previous manifest references
+    pattern = re.compile(r'\.[0-9a-f]{%d}\.json$' % HASH_LENGTH)
+    removed = 0
+    for root, _, files in os.walk(out_dir):
+        for name in files:
+            rel_path = os.path.relpath(os.path.join(root, name), out_dir).replace(os.sep, '/')
+            if pattern.search(name) and rel_path not in keep:
+                os.remove(os.path.join(root, name))
+                removed += 1
+    return removed
+
+def write_dashboard_feed(df, summaries, out_dir=FEED_DIR):
+    """
+    Emit precomputed JSON for the website:
+      - league.<hash>.json   ranked standings with streaks
+      - streaks.<hash>.json  {username: [academic, physical, mental]}
+      - users/<name>.<hash>.json  per-user summary and per-day series
+      - manifest.json        unhashed index pointing at the current files
+    Unchanged users hash to the same filename and are not rewritten. The
+    files of the previous manifest (kept as manifest.previous.json) stay on
+    disk for one more generation, so a page that loaded the old manifest
+    just before the switch can still fetch what it points at.
+    """
+    try:
+        os.makedirs(out_dir, exist_ok=True)
+        ranked = summaries.sort_values(by='average_score', ascending=False)
+
+        league = [dict(username=u, rank=i + 1, **_summary_record(row)) for i, (u, row) in enumerate(ranked.iterrows())]
+        league_path, _ = _write_hashed(out_dir, 'league', league)
+        streaks = {u: [int(row[col]) for col in STREAK_COLS] for u, row in ranked.iterrows()}
+        streaks_path, _ = _write_hashed(out_dir, 'streaks', streaks)
+
+        series = _daily_series(df[df['username'].isin(ranked.index)])
+        user_paths = {}
+        rewritten = 0
+        for username, row in ranked.iterrows():
+            payload = {'username': username, 'summary': _summary_record(row), 'series': series.get(username)}
+            user_paths[username], written = _write_hashed(out_dir, f"users/{_safe_name(username)}", payload)
+            rewritten += written
+
+        manifest = {'league': league_path, 'streaks': streaks_path, 'users': user_paths}
+        manifest_path = os.path.join(out_dir, 'manifest.json')
+        previous_path = os.path.join(out_dir, 'manifest.previous.json')
+        try:
+            with open(manifest_path, 'r') as f:
+                previous = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            previous = {}
+        if {k: previous.get(k) for k in manifest} != manifest:
+            if previous:
+                _atomic_write(previous_path, _compact_json(previous))
+            manifest['generated_at'] = datetime.now().isoformat(timespec='seconds')
+            _atomic_write(manifest_path, _compact_json(manifest))
+
+        try:
+            with open(previous_path, 'r') as f:
+                older = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            older = {}
+        removed = _remove_stale(out_dir, _manifest_paths(manifest) | _manifest_paths(older))
+        print(f"✅ Dashboard feed saved to {out_dir} ({rewritten} user files rewritten, {removed} stale removed)")
+        return manifest
+    except Exception as e:
+        print(f"❌ Error writing dashboard feed: {e}")
+        return None
@@ -0,0 +1,136 @@
+import os
+import numpy as np
+import pandas as pd
+from state_journal import file_lock
+
+HABIT_COLS = ['physics', 'additional_subject_chemistrymaths', 'exercise', 'wake_up', 'screen_control']
+HABIT_BITS_PATH = 'streaks_state.habits.npz'   # persisted next to streaks_state.json
+
+# One uint8 per user per day: bits 0-4 are the habits above, bit 5 marks "submitted that day"
+ALL_HABITS = (1 << len(HABIT_COLS)) - 1
+LOGGED_BIT = 1 << len(HABIT_COLS)
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+def habit_mask(cols):
+    """Bitmask with the bits of the given habit columns set."""
+    mask = 0
+    for col in cols:
+        mask |= 1 << HABIT_COLS.index(col)
+    return mask
+
+def build_habit_bits(df, start_date, end_date):
+    """
+    Pack submissions into a (users, days) uint8 array covering start_date..end_date.
+    Several submissions on one day are OR-ed together (a habit counts if any
+    submission that day has it done). Returns (users, bits).
+    """
+    n_days = (end_date - start_date).days + 1
+    dates = df['timestamp'].to_numpy().astype('datetime64[D]')
+    day_idx = ((dates - np.datetime64(start_date, 'D')) // np.timedelta64(1, 'D')).astype(int)
+    in_range = (day_idx >= 0) & (day_idx < n_days)
+    codes, users = pd.factorize(df['username'].to_numpy()[in_range], sort=True)
+
+    weights = (1 << np.arange(len(HABIT_COLS))).astype(np.uint8)
+    done = df[HABIT_COLS].to_numpy()[in_range] > 0
+    masks = (done.astype(np.uint8) @ weights).astype(np.uint8) | LOGGED_BIT
+
+    bits = np.zeros((len(users), n_days), dtype=np.uint8)
+    np.bitwise_or.at(bits, (codes, day_idx[in_range]), masks)
+    return np.asarray(users, dtype=str), bits
+
+def streak_from_bits(days, required_mask, mercy_days=2):
+    """
+    Streak on one user's row of day bitmasks (the last element is the end date):
+      - a logged day missing any required habit breaks the streak
+      - up to mercy_days missing days in a row are tolerated
+      - no log within mercy_days of the end date means no visible streak
+    """
+    logged = (days & LOGGED_BIT) != 0
+    logged_idx = np.flatnonzero(logged)
+    if logged_idx.size == 0:
+        return 0
+    last = logged_idx[-1]
+    if len(days) - 1 - last > mercy_days:
+        return 0
+
+    # Walk backwards from the last log
+    walk = days[last::-1]
+    walk_logged = logged[last::-1]
+    valid = walk_logged & ((walk & required_mask) == required_mask)
+    stop = len(walk)
+    broken = np.flatnonzero(walk_logged & ~valid)
+    if broken.size:
+        stop = broken[0]
+    # First run of more than mercy_days missing days
+    window = mercy_days + 1
+    if stop >= window:
+        missing_run = np.convolve(~walk_logged[:stop], np.ones(window, dtype=int), mode='valid')
+        gaps = np.flatnonzero(missing_run == window)
+        if gaps.size:
+            stop = gaps[0]
+    return int(valid[:stop].sum())
+
+def days_logged(bits):
+    return ((bits & LOGGED_BIT) != 0).sum(axis=-1)
+
+def completion_rates(bits):
+    """Share of all habit slots completed on logged days (popcount of the habit bits)."""
+    logged = days_logged(bits)
+    done = POPCOUNT[bits & ALL_HABITS].sum(axis=-1, dtype=np.int64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(logged > 0, done / (logged * len(HABIT_COLS)), 0.0)
+
+def habit_averages(bits):
+    """
+    Per-habit completion over logged days, shaped like habit_cols.mean()
+    for plot_radar_chart. Accepts one user's row or a (users, days) array.
+    """
+    counts = np.stack([((bits >> i) & 1).sum(axis=-1) for i in range(len(HABIT_COLS))], axis=-1)
+    logged = np.maximum(days_logged(bits), 1)
+    averages = counts / np.expand_dims(logged, -1)
+    if averages.ndim == 1:
+        return pd.Series(averages, index=HABIT_COLS)
+    return averages
+
+def merge_habit_bits(old, new):
+    """
+    Merge two (users, bits, start_date) histories; rows in `new` replace
+    rows for the same users in `old`. Both must share the start date.
+    """
+    old_users, old_bits, start_date = old
+    new_users, new_bits, new_start = new
+    if str(start_date) != str(new_start):
+        return new
+    n_days = max(old_bits.shape[1], new_bits.shape[1])
+    keep = ~np.isin(old_users, new_users)
+    users = np.concatenate([old_users[keep], new_users])
+    bits = np.zeros((len(users), n_days), dtype=np.uint8)
+    bits[:keep.sum(), :old_bits.shape[1]] = old_bits[keep]
+    bits[keep.sum():, :new_bits.shape[1]] = new_bits
+    order = np.argsort(users, kind='stable')
+    return users[order], bits[order], start_date
+
+def save_habit_bits(users, bits, start_date, path=HABIT_BITS_PATH, merge=False):
+    """Persist the packed history (compressed) with an atomic replace."""
+    try:
+        # Same lock discipline as the streak journal, so overlapping runs cannot drop each other's merge
+        with file_lock(path):
+            if merge:
+                old = load_habit_bits(path)
+                if old is not None:
+                    users, bits, start_date = merge_habit_bits(old, (users, bits, start_date))
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                np.savez_compressed(f, users=np.asarray(users, dtype=str), bits=bits, start_date=str(start_date))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"❌ Error saving habit history: {e}")
+
+def load_habit_bits(path=HABIT_BITS_PATH):
+    """Returns (users, bits, start_date) or None if nothing is stored yet."""
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        return data['users'], data['bits'], pd.to_datetime(str(data['start_date'])).date()
@@ -0,0 +1,101 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PIL import Image
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# Each profile: format, dpi (raster only), optional max_size for thumbnails,
+# and the suffix added to the base filename. 'print' keeps the original
+# filename; it is the file the PDF reports embed.
+OUTPUT_PROFILES = {
+    'print': {'format': 'png', 'dpi': 150, 'suffix': ''},
+    'web': {'format': 'webp', 'dpi': 100, 'quality': 80, 'suffix': ''},
+    'thumb': {'format': 'webp', 'dpi': 100, 'quality': 70, 'max_size': (320, 320), 'suffix': '.thumb'},
+    'vector': {'format': 'svg', 'suffix': ''},
+}
+DEFAULT_PROFILES = ('print', 'web', 'thumb')
+
+def _active_profiles(raw):
+    names = []
+    for name in (part.strip() for part in raw.split(',')):
+        if not name:
+            continue
+        if name not in OUTPUT_PROFILES:
+            print(f"⚠️ Unknown image profile '{name}' in GROWTH_IMAGE_PROFILES, ignoring it "
+                  f"(known: {', '.join(OUTPUT_PROFILES)})")
+        elif name not in names:
+            names.append(name)
+    if not names:
+        print(f"⚠️ No usable image profiles in GROWTH_IMAGE_PROFILES, using {','.join(DEFAULT_PROFILES)}")
+        return DEFAULT_PROFILES
+    return tuple(names)
+
+# Comma-separated profile names, e.g. GROWTH_IMAGE_PROFILES=print,thumb
+ACTIVE_PROFILES = _active_profiles(os.environ.get('GROWTH_IMAGE_PROFILES', ','.join(DEFAULT_PROFILES)))
+PDF_PROFILE = 'print'
+
+def profile_path(filename, profile):
+    stem, _ = os.path.splitext(filename)
+    return f"{stem}{profile['suffix']}.{profile['format']}"
+
+def _profile_names(profiles, for_pdf):
+    names = list(ACTIVE_PROFILES if profiles is None else profiles)
+    if for_pdf and PDF_PROFILE not in names:
+        # A chart embedded in a PDF needs its PNG whatever else is selected
+        names.insert(0, PDF_PROFILE)
+    return names
+
+def output_paths(filename, profiles=None, for_pdf=False):
+    """The files save_figure writes for filename with the same arguments."""
+    return [profile_path(filename, OUTPUT_PROFILES[name]) for name in _profile_names(profiles, for_pdf)]
+
+def _encode(image, render_dpi, profile, path):
+    if 'max_size' in profile:
+        # thumbnail() shrinks straight from the full render, no intermediate resize
+        image = image.copy()
+        image.thumbnail(profile['max_size'], Image.LANCZOS)
+    elif profile['dpi'] < render_dpi:
+        scale = profile['dpi'] / render_dpi
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        image = image.resize(size, Image.LANCZOS, reducing_gap=2.0)
+    if profile['format'] == 'webp':
+        image.save(path, 'WEBP', quality=profile.get('quality', 80), method=4)
+    else:
+        image.save(path, profile['format'].upper())
+    return path
+
+def save_figure(fig, filename, profiles=None, for_pdf=False):
+    """
+    Save fig in every active output profile. The figure is rasterized once at
+    the highest DPI any raster profile needs; each profile is then resized
+    and encoded from that buffer with Pillow, in parallel. SVG profiles are
+    written by matplotlib directly. With for_pdf=True the 'print' PNG at
+    filename is always written. Returns the list of files written.
+    """
+    selected = [(name, OUTPUT_PROFILES[name]) for name in _profile_names(profiles, for_pdf)]
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    written = []
+    for _, profile in selected:
+        if profile['format'] == 'svg':
+            fig.savefig(profile_path(filename, profile), format='svg')
+            written.append(profile_path(filename, profile))
+
+    raster = [profile for _, profile in selected if profile['format'] != 'svg']
+    if raster:
+        render_dpi = max(profile['dpi'] for profile in raster)
+        original_dpi = fig.dpi
+        fig.set_dpi(render_dpi)
+        canvas = FigureCanvasAgg(fig)
+        canvas.draw()
+        # Figures are opaque, so drop alpha: smaller files and faster encoders
+        image = Image.fromarray(np.asarray(canvas.buffer_rgba())[..., :3].copy())
+        fig.set_dpi(original_dpi)
+        # Pillow releases the GIL while encoding, so threads overlap the work
+        with ThreadPoolExecutor(max_workers=len(raster)) as executor:
+            written += list(executor.map(
+                lambda profile: _encode(image, render_dpi, profile, profile_path(filename, profile)), raster
+            ))
+    return written
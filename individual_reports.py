@@ -4,11 +4,12 @@ from datetime import datetime
 import matplotlib.pyplot as plt
 import numpy as np
 import re
-import json
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.utils import ImageReader
 from PIL import Image
+from image_output import save_figure
+from chart_config import resolve_user_style, chart_style
 
 CSV_PATH = "form_data/growth_data.csv"
 
@@ -60,25 +61,18 @@ def plot_individual_trends(df, username):
     if user_df.empty:
         return None
     
-    try:
-        with open('user_config.json', 'r') as f:
-            user_config = json.load(f)
-        config = user_config.get(username, {})
-        title = config.get('title', f'Daily Score Trends for {username}')
-        color = config.get('color', 'blue')
-    except FileNotFoundError:
-        title = f'Daily Score Trends for {username}'
-        color = 'blue'
+    # Parsed once per run (and again only if the file changes), see chart_config.py
+    title, color = resolve_user_style(username)
     
     fig, ax = plt.subplots()
-    ax.plot(user_df['timestamp'], user_df['daily_score'], marker='o', color=color)
+    ax.plot(user_df['timestamp'], user_df['daily_score'], marker=chart_style('trend_marker'), color=color)
     ax.set_xlabel('Date')
     ax.set_ylabel('Daily Score')
     ax.set_title(title)
     plt.xticks(rotation=45)
     plt.tight_layout()
     filename = f'data/individual_images/{username}_trends.png'
-    plt.savefig(filename)
+    save_figure(fig, filename, for_pdf=True)
     plt.close()
     return filename
 
@@ -1,6 +1,8 @@
 import os
 import matplotlib.pyplot as plt
 import numpy as np
+from image_output import save_figure
+from chart_config import chart_style, user_color
 
 def plot_radar_chart(habit_averages, username):
     labels = ['Physics', 'Additional Subject', 'Exercise', 'Wake Up', 'Screen Control']
@@ -8,9 +10,11 @@ def plot_radar_chart(habit_averages, username):
     angles = np.linspace(0, 2 * np.pi, len(labels), endpoint=False).tolist()
     angles += angles[:1]
     
-    fig, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(projection='polar'))
-    ax.fill(angles, values, 'b', alpha=0.25)
-    ax.plot(angles, values, 'o-', linewidth=2)
+    # A user's configured color wins over the default radar styling
+    color = user_color(username)
+    fig, ax = plt.subplots(figsize=chart_style('radar_figsize'), subplot_kw=dict(projection='polar'))
+    ax.fill(angles, values, color=color or chart_style('radar_fill_color'), alpha=chart_style('radar_fill_alpha'))
+    ax.plot(angles, values, 'o-', color=color, linewidth=chart_style('radar_linewidth'))
     ax.set_xticks(angles[:-1])
     ax.set_xticklabels(labels)
     ax.set_ylim(0, 1)
@@ -19,6 +23,6 @@ def plot_radar_chart(habit_averages, username):
     
     os.makedirs('data/individual_images', exist_ok=True)
     filename = f'data/individual_images/{username}_radar.png'
-    plt.savefig(filename)
+    save_figure(fig, filename, for_pdf=True)
     plt.close()
     return filename 
\ No newline at end of file
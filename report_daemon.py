@@ -0,0 +1,184 @@
+import os
+import json
+import time
+import argparse
+import threading
+import traceback
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pandas as pd
+
+# Importing these once keeps pandas, matplotlib and ReportLab warm for every refresh
+from analyze_csv import CSV_PATH, prepare_dataframe, generate_user_summaries, generate_individual_report
+from weekly_report import generate_weekly_report
+from dashboard_feed import write_dashboard_feed
+from habit_bits import load_habit_bits
+from report_queue import user_fingerprints, run_report_jobs
+
+WATCH_DIR = "form_data"
+POLL_INTERVAL = 1.0      # seconds between directory scans
+DEBOUNCE_SECONDS = 5.0   # wait for this much quiet after the last change before recomputing
+HEALTH_HOST = "127.0.0.1"
+HEALTH_PORT = 8765
+
+class ReportDaemon:
+    """
+    Resident report worker. Keeps the normalized data and per-user summaries
+    in memory and, when form_data/ changes, only recomputes the users whose
+    rows changed (or everyone, when the competition window moved).
+    """
+    def __init__(self, csv_path=CSV_PATH, watch_dir=WATCH_DIR, debounce=DEBOUNCE_SECONDS):
+        self.csv_path = csv_path
+        self.watch_dir = watch_dir
+        self.debounce = debounce
+        self.df = None
+        self.summaries = None
+        self.user_hashes = {}
+        self.end_date = None
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        self.metrics = {
+            'runs': 0,
+            'failed_runs': 0,
+            'last_run_at': None,
+            'last_run_seconds': None,
+            'last_users_recomputed': 0,
+            'users_recomputed_total': 0,
+            'users_tracked': 0,
+            'pending_change': False,
+            'last_error': None,
+        }
+
+    def _snapshot(self):
+        state = {}
+        if not os.path.isdir(self.watch_dir):
+            return state
+        for entry in os.scandir(self.watch_dir):
+            if entry.is_file():
+                stat = entry.stat()
+                state[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def refresh(self):
+        started = time.perf_counter()
+        if not os.path.exists(self.csv_path) or os.path.getsize(self.csv_path) == 0:
+            print(f"⚠️ {self.csv_path} is missing or empty, skipping refresh")
+            return
+
+        df = prepare_dataframe(self.csv_path)
+        if df.empty:
+            print("⚠️ No usable rows after loading, skipping refresh")
+            return
+        hashes = user_fingerprints(df)
+        end_date = df['timestamp'].max().date()
+
+        if self.summaries is None or end_date != self.end_date:
+            # First run, or the window moved: every average and streak depends on it
+            changed = set(hashes)
+        else:
+            changed = {u for u, h in hashes.items() if self.user_hashes.get(u) != h}
+        removed = set(self.user_hashes) - set(hashes)
+
+        summaries = self.summaries
+        if changed or summaries is None:
+            updated = generate_user_summaries(df, users=changed)
+            if summaries is None or len(changed) == len(hashes):
+                summaries = updated
+            else:
+                summaries = pd.concat([summaries.drop(index=list(changed | removed), errors='ignore'), updated])
+                summaries = summaries.sort_values(by='average_score', ascending=False)
+        elif removed:
+            summaries = summaries.drop(index=list(removed), errors='ignore')
+
+        habit_history = load_habit_bits()
+        run_report_jobs(
+            df, summaries,
+            lambda user: generate_individual_report(df, user, summaries, habit_history),
+            users=[u for u in changed if u in summaries.index]
+        )
+        if changed or removed:
+            write_dashboard_feed(df, summaries)
+            generate_weekly_report()
+
+        with self.lock:
+            self.df, self.summaries = df, summaries
+            self.user_hashes, self.end_date = hashes, end_date
+            self.metrics['runs'] += 1
+            self.metrics['last_run_at'] = datetime.now().isoformat(timespec='seconds')
+            self.metrics['last_run_seconds'] = round(time.perf_counter() - started, 3)
+            self.metrics['last_users_recomputed'] = len(changed)
+            self.metrics['users_recomputed_total'] += len(changed)
+            self.metrics['users_tracked'] = len(hashes)
+            self.metrics['last_error'] = None
+        print(f"✅ Refresh done: {len(changed)} users recomputed in {self.metrics['last_run_seconds']}s")
+
+    def run(self, poll_interval=POLL_INTERVAL):
+        last_snapshot = self._snapshot()
+        pending_since = time.time()   # always refresh once on startup
+        print(f"👀 Watching {self.watch_dir}/ (debounce {self.debounce}s)")
+        while True:
+            snapshot = self._snapshot()
+            if snapshot != last_snapshot:
+                # Restart the quiet period on every change so bursts collapse into one refresh
+                last_snapshot = snapshot
+                pending_since = time.time()
+            self.metrics['pending_change'] = pending_since is not None
+            if pending_since is not None and time.time() - pending_since >= self.debounce:
+                pending_since = None
+                try:
+                    self.refresh()
+                except Exception as e:
+                    with self.lock:
+                        self.metrics['failed_runs'] += 1
+                        self.metrics['last_error'] = f"{type(e).__name__}: {e}"
+                    print(f"❌ Refresh failed: {e}")
+                    traceback.print_exc()
+            time.sleep(poll_interval)
+
+    def health(self):
+        with self.lock:
+            return {
+                'status': 'error' if self.metrics['last_error'] else 'ok',
+                'uptime_seconds': round(time.time() - self.started_at, 1),
+                'last_run_at': self.metrics['last_run_at'],
+            }
+
+    def metrics_snapshot(self):
+        with self.lock:
+            return dict(self.metrics, uptime_seconds=round(time.time() - self.started_at, 1))
+
+def serve_health(daemon, host=HEALTH_HOST, port=HEALTH_PORT):
+    """Expose GET /health and GET /metrics as JSON on a background thread."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            routes = {'/health': daemon.health, '/metrics': daemon.metrics_snapshot}
+            if self.path not in routes:
+                self.send_error(404)
+                return
+            body = json.dumps(routes[self.path]()).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"🩺 Health endpoint on http://{host}:{port}/health and /metrics")
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Watch form_data/ and keep reports up to date")
+    parser.add_argument('--port', type=int, default=HEALTH_PORT)
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_SECONDS)
+    args = parser.parse_args()
+
+    daemon = ReportDaemon(debounce=args.debounce)
+    serve_health(daemon, port=args.port)
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        print("\n👋 Report daemon stopped")
@@ -0,0 +1,107 @@
+import os
+import json
+import time
+import heapq
+import hashlib
+import traceback
+import pandas as pd
+from state_journal import atomic_write_json
+from chart_config import load_user_config
+from image_output import ACTIVE_PROFILES
+
+CHECKPOINT_PATH = "data/.report_checkpoint.json"
+CHECKPOINT_EVERY_SECONDS = 2.0   # a hard kill loses at most this much finished work
+
+def user_fingerprints(df):
+    """One 64-bit hash per user, summed over the user's rows: changes when any row changes."""
+    row_hashes = pd.util.hash_pandas_object(df.drop(columns=['date'], errors='ignore'), index=False)
+    return row_hashes.groupby(df['username'].to_numpy()).sum().to_dict()
+
+def _job_version(row_hash, summary_row, style):
+    # A report depends on the user's rows, their summary (which moves with the
+    # competition window), how their charts are styled and which image files are written
+    digest = hashlib.sha256(f"{row_hash}|{summary_row.to_dict()}|{style}".encode())
+    return digest.hexdigest()[:16]
+
+def prioritized_users(df, users):
+    """
+    Heap of (priority, -last submission, username): users who submitted on
+    the latest day in the data come first, then the most recent submitters.
+    """
+    last_seen = df.groupby('username')['timestamp'].max()
+    latest_day = df['timestamp'].max().normalize()
+    heap = []
+    for user in users:
+        last = last_seen.get(user)
+        fresh = last is not None and last >= latest_day
+        heap.append((0 if fresh else 1, -(last.value if last is not None else 0), user))
+    heapq.heapify(heap)
+    return heap
+
+def load_checkpoint(path=CHECKPOINT_PATH):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {'done': {}, 'failed': {}}
+
+def run_report_jobs(df, summaries, job, users=None, checkpoint_path=CHECKPOINT_PATH, time_budget=None, force=False):
+    """
+    Run job(username) for each user, freshest submitters first. job returns
+    the list of files it wrote (or None).
+
+      - finished users are checkpointed with a version of their inputs and
+        their output files, so a rerun after a crash skips them unless their
+        data changed or one of those files is gone
+      - an exception in one user's job is recorded and the batch moves on
+      - with time_budget (seconds), no new job starts once it is spent
+
+    Returns {'done', 'failed', 'skipped', 'remaining'}.
+    """
+    started = time.monotonic()
+    if users is None:
+        users = [u for u in df['username'].unique() if u in summaries.index]
+    checkpoint = {'done': {}, 'failed': {}} if force else load_checkpoint(checkpoint_path)
+    fingerprints = user_fingerprints(df[df['username'].isin(users)])
+    os.makedirs(os.path.dirname(checkpoint_path) or '.', exist_ok=True)
+
+    result = {'done': [], 'failed': {}, 'skipped': 0, 'remaining': []}
+    heap = prioritized_users(df, users)
+    last_saved = time.monotonic()
+    try:
+        while heap:
+            if time_budget is not None and time.monotonic() - started >= time_budget:
+                result['remaining'] = [user for _, _, user in sorted(heap)]
+                print(f"⏳ Time budget of {time_budget}s spent, {len(heap)} reports left for the next run")
+                break
+            _, _, user = heapq.heappop(heap)
+            config = load_user_config()
+            style = (config['users'].get(user), sorted(config['charts'].items()), ACTIVE_PROFILES)
+            version = _job_version(fingerprints.get(user), summaries.loc[user], style)
+            previous = checkpoint['done'].get(user)
+            if (
+                isinstance(previous, dict) and previous.get('version') == version
+                and all(os.path.exists(p) for p in previous.get('outputs', []))
+            ):
+                result['skipped'] += 1
+                continue
+            try:
+                outputs = job(user)
+            except Exception as e:
+                checkpoint['failed'][user] = f"{type(e).__name__}: {e}"
+                result['failed'][user] = checkpoint['failed'][user]
+                print(f"❌ Report failed for {user}: {e}")
+                traceback.print_exc()
+            else:
+                checkpoint['done'][user] = {'version': version, 'outputs': list(outputs or [])}
+                checkpoint['failed'].pop(user, None)
+                result['done'].append(user)
+            if time.monotonic() - last_saved >= CHECKPOINT_EVERY_SECONDS:
+                atomic_write_json(checkpoint_path, checkpoint)
+                last_saved = time.monotonic()
+    finally:
+        atomic_write_json(checkpoint_path, checkpoint)
+
+    print(f"✅ Reports: {len(result['done'])} generated, {result['skipped']} unchanged, "
+          f"{len(result['failed'])} failed, {len(result['remaining'])} deferred")
+    return result
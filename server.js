@@ -37,11 +37,21 @@ const securityHeaders = {
     'Referrer-Policy': 'strict-origin-when-cross-origin'
 };
 
+// Content-hashed files (e.g. feed/league.3f9a0c1b2d4e.json) never change once written
+const HASHED_ASSET = /\.[0-9a-f]{12}\.[a-z0-9]+$/i;
+
 // Cache control for static assets
 const getCacheControl = (filePath) => {
     const ext = path.extname(filePath).toLowerCase();
     const staticAssets = ['.css', '.js', '.png', '.jpg', '.gif', '.svg', '.woff', '.woff2', '.ttf', '.eot', '.ico', '.webp'];
     
+    if (HASHED_ASSET.test(filePath)) {
+        return NODE_ENV === 'production' ? 'public, max-age=31536000, immutable' : 'public, max-age=3600';
+    }
+    // The feed manifest points at the current hashed files, so it must always be revalidated
+    if (path.basename(filePath) === 'manifest.json') {
+        return 'no-cache';
+    }
     if (staticAssets.includes(ext)) {
         return NODE_ENV === 'production' ? 'public, max-age=31536000, immutable' : 'public, max-age=3600';
     }
@@ -0,0 +1,113 @@
+import os
+import json
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+JOURNAL_SUFFIX = '.journal'
+COMPACT_THRESHOLD_BYTES = 256 * 1024   # fold the journal into the snapshot past this size
+
+@contextmanager
+def file_lock(path):
+    """Exclusive lock on <path>.lock so overlapping runs take turns."""
+    with open(path + '.lock', 'a+') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+def atomic_write_json(path, payload, indent=None):
+    """Write to a temp file in the same directory, fsync, then rename over the target."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(payload, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)  # mkstemp creates the file as 0600
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _read_snapshot(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _replay_journal(state, journal_path):
+    if not os.path.exists(journal_path):
+        return state
+    with open(journal_path, 'r') as f:
+        for line in f:
+            try:
+                state.update(json.loads(line))
+            except json.JSONDecodeError:
+                # A torn final line from a crash mid-append; everything before it is intact
+                break
+    return state
+
+def _drop_torn_tail(journal_path):
+    # Cut a partial last line so the next append starts on a clean line
+    if not os.path.exists(journal_path):
+        return
+    with open(journal_path, 'rb+') as f:
+        data = f.read()
+        if data and not data.endswith(b'\n'):
+            f.truncate(data.rfind(b'\n') + 1)
+
+def load_state(path):
+    """Snapshot at `path` with every journal entry replayed on top."""
+    return _replay_journal(_read_snapshot(path), path + JOURNAL_SUFFIX)
+
+def compact(path):
+    """Fold the journal into a fresh snapshot. Caller must hold file_lock(path)."""
+    journal_path = path + JOURNAL_SUFFIX
+    atomic_write_json(path, load_state(path), indent=4)
+    # Entries are whole per-user records, so replaying them again after a crash here is harmless
+    open(journal_path, 'w').close()
+
+def record_changes(path, records, ignore_keys=(), compact_threshold=COMPACT_THRESHOLD_BYTES):
+    """
+    Append the records that differ from the current state (ignoring
+    `ignore_keys` when comparing) as one journal line, under a lock.
+    Returns the dict of records that were written.
+    """
+    def comparable(record):
+        return {k: v for k, v in record.items() if k not in ignore_keys}
+
+    journal_path = path + JOURNAL_SUFFIX
+    with file_lock(path):
+        state = load_state(path)
+        changed = {
+            key: record for key, record in records.items()
+            if key not in state or comparable(state[key]) != comparable(record)
+        }
+        if changed:
+            _drop_torn_tail(journal_path)
+            with open(journal_path, 'a') as f:
+                f.write(json.dumps(changed, separators=(',', ':')) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+        journal_size = os.path.getsize(journal_path) if os.path.exists(journal_path) else 0
+        if journal_size > compact_threshold or (changed and not os.path.exists(path)):
+            # Also compact on the first write, so the snapshot file always exists for readers
+            compact(path)
+    return changed
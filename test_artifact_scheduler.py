@@ -0,0 +1,54 @@
+import os
+import pytest
+from artifact_scheduler import Artifact, run_artifacts
+
+def write_file(path, *deps):
+    with open(path, 'w') as f:
+        f.write(path)
+    return [path]
+
+def graph(tmp_path):
+    a, b, c = (str(tmp_path / f"{name}.txt") for name in "abc")
+    return [
+        Artifact('a', write_file, args=(a,)),
+        Artifact('b', write_file, args=(b,), deps=('a',)),
+        Artifact('c', write_file, args=(c,), deps=('a',)),
+    ], b
+
+@pytest.mark.parametrize('max_workers', [1, 4])
+def test_reruns_unchanged_upstream_of_stale_file_node(tmp_path, max_workers):
+    manifest_path = str(tmp_path / 'manifest.json')
+    artifacts, b = graph(tmp_path)
+    first = run_artifacts(artifacts, max_workers=max_workers, manifest_path=manifest_path)
+    assert all(info['status'] == 'ran' for info in first.values())
+
+    os.remove(b)
+    second = run_artifacts(artifacts, max_workers=max_workers, manifest_path=manifest_path)
+    assert second['a']['status'] == 'ran'
+    assert second['b']['status'] == 'ran'
+    assert second['c']['status'] == 'skipped'
+    assert os.path.exists(b)
+
+def test_skips_everything_when_unchanged(tmp_path):
+    manifest_path = str(tmp_path / 'manifest.json')
+    artifacts, _ = graph(tmp_path)
+    run_artifacts(artifacts, max_workers=1, manifest_path=manifest_path)
+    report = run_artifacts(artifacts, max_workers=1, manifest_path=manifest_path)
+    assert all(info['status'] == 'skipped' for info in report.values())
+
+def write_pages(prefix, n_pages):
+    paths = [f"{prefix}_p{page}.txt" for page in range(1, n_pages + 1)]
+    for path in paths:
+        with open(path, 'w') as f:
+            f.write(path)
+    return paths
+
+def test_rerun_removes_outputs_no_longer_written(tmp_path):
+    manifest_path = str(tmp_path / 'manifest.json')
+    prefix = str(tmp_path / 'chart')
+    run_artifacts([Artifact('chart', write_pages, args=(prefix, 3))], max_workers=1, manifest_path=manifest_path)
+    assert os.path.exists(f"{prefix}_p3.txt")
+
+    run_artifacts([Artifact('chart', write_pages, args=(prefix, 2))], max_workers=1, manifest_path=manifest_path)
+    assert os.path.exists(f"{prefix}_p2.txt")
+    assert not os.path.exists(f"{prefix}_p3.txt")
@@ -0,0 +1,44 @@
+from datetime import date
+import numpy as np
+import pandas as pd
+from habit_bits import HABIT_COLS, LOGGED_BIT, build_habit_bits, habit_mask, streak_from_bits
+
+REQUIRED = habit_mask(['physics', 'additional_subject_chemistrymaths'])
+VALID = LOGGED_BIT | REQUIRED
+INVALID = LOGGED_BIT | habit_mask(['physics'])   # logged, but missing a required habit
+MISSING = 0
+
+def streak(*days, mercy_days=2):
+    return streak_from_bits(np.array(days, dtype=np.uint8), REQUIRED, mercy_days=mercy_days)
+
+def test_counts_consecutive_valid_days():
+    assert streak(VALID, VALID, VALID) == 3
+
+def test_logged_day_missing_required_habit_breaks_streak():
+    assert streak(VALID, INVALID, VALID, VALID) == 2
+    assert streak(VALID, VALID, INVALID) == 0
+
+def test_gaps_up_to_mercy_days_are_tolerated():
+    assert streak(VALID, MISSING, MISSING, VALID, VALID) == 3
+
+def test_gap_longer_than_mercy_days_stops_streak():
+    assert streak(VALID, MISSING, MISSING, MISSING, VALID, VALID) == 2
+    assert streak(VALID, MISSING, VALID, mercy_days=0) == 1
+
+def test_last_log_older_than_mercy_days_gives_zero():
+    assert streak(VALID, VALID, MISSING, MISSING) == 2
+    assert streak(VALID, VALID, MISSING, MISSING, MISSING) == 0
+    assert streak(MISSING, MISSING) == 0
+
+def test_same_day_submissions_are_combined():
+    df = pd.DataFrame({
+        'username': ['a', 'a', 'b'],
+        'timestamp': pd.to_datetime(['2025-01-02 08:00', '2025-01-02 20:00', '2025-01-01 09:00']),
+        **{col: [0, 0, 0] for col in HABIT_COLS},
+    })
+    df.loc[0, 'physics'] = 1
+    df.loc[1, 'additional_subject_chemistrymaths'] = 1
+    users, bits = build_habit_bits(df, date(2025, 1, 1), date(2025, 1, 2))
+    assert list(users) == ['a', 'b']
+    assert bits[0].tolist() == [MISSING, VALID]
+    assert bits[1].tolist() == [LOGGED_BIT, MISSING]
@@ -1,8 +1,15 @@
 import pandas as pd
 from datetime import datetime, timedelta
 import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 import numpy as np
 import os
+import argparse
+from artifact_scheduler import Artifact, run_artifacts, print_artifact_report
+from image_output import save_figure, ACTIVE_PROFILES
+from chart_config import chart_style, user_color, load_user_config
 
 CSV_PATH = "form_data/growth_data.csv"
 
@@ -74,122 +81,430 @@ def generate_weekly_league(week_df):
     return league.sort_values(by="total_score", ascending=False)
 
 def plot_weekly_average_scores(league):
-    fig, ax = plt.subplots()
-    ax.bar(league.index, league['average_score'])
+    fig, ax = plt.subplots(figsize=chart_style('bar_figsize'))
+    ax.bar(league.index, league['average_score'], color=chart_style('bar_color'))
     ax.set_xlabel('User')
     ax.set_ylabel('Average Score')
     ax.set_title('Weekly Average Scores per User')
     plt.xticks(rotation=45)
     plt.tight_layout()
     os.makedirs('data', exist_ok=True)
-    plt.savefig('data/weekly_average_scores.png')
+    files = save_figure(fig, 'data/weekly_average_scores.png')
     plt.close()
+    return files
 
 def plot_weekly_table(league):
+    os.makedirs('data', exist_ok=True)
     table_data = league.round(2).reset_index().values
     col_labels = ['Username'] + list(league.columns)
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = plt.subplots(figsize=chart_style('table_figsize'))
     ax.axis('tight')
     ax.axis('off')
     table = ax.table(cellText=table_data, colLabels=col_labels, loc='center')
     table.auto_set_font_size(False)
-    table.set_fontsize(10)
+    table.set_fontsize(chart_style('table_fontsize'))
     table.scale(1.2, 1.2)
     plt.title('Weekly League Table')
-    plt.savefig('data/weekly_league_table.png')
+    files = save_figure(fig, 'data/weekly_league_table.png')
     plt.close()
+    return files
 
-def plot_user_growth_lines(week_df):
-    fig, ax = plt.subplots(figsize=(10, 6))
-    for username, group in week_df.groupby('username'):
-        group = group.sort_values('timestamp')
-        ax.plot(group['timestamp'], group['daily_score'], marker='o', label=username)
-    ax.set_xlabel('Date')
-    ax.set_ylabel('Daily Score')
-    ax.set_title('Weekly Growth: Daily Scores per User')
-    ax.legend()
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig('data/weekly_user_growth_lines.png')
-    plt.close()
+# Multi-user chart settings
+MAX_LEGEND_USERS = 12   # above this many users the per-user legend is dropped
+TOP_K_USERS = 5         # users highlighted in "topk" mode
+FACETS_PER_PAGE = 16    # users per figure in "facets" mode
+FACET_COLUMNS = 4
+
+def _page_filename(filename, page, n_pages):
+    # Single-page output keeps the original filename
+    if n_pages <= 1:
+        return filename
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}_p{page}{ext}"
+
+def _user_series(week_df, cumulative=False):
+    """
+    Sort the week once and return flat per-point arrays plus per-user offsets,
+    so every chart can be drawn without a per-user groupby.
+    """
+    ordered = week_df.sort_values(['username', 'timestamp'], kind='stable')
+    names = ordered['username'].to_numpy()
+    users, starts = np.unique(names, return_index=True)
+    codes = np.repeat(np.arange(len(users)), np.diff(np.r_[starts, len(names)]))
+
+    times = ordered['timestamp'].to_numpy()
+    start_day = times.min().astype('datetime64[D]')
+    days = ((times - start_day) // np.timedelta64(1, 'D')).astype(int)
+
+    scores = ordered['daily_score'].to_numpy(dtype=float)
+    totals = np.add.reduceat(scores, starts)
+    values = scores
+    if cumulative:
+        # Running total restarted at every user boundary
+        running = np.cumsum(scores)
+        offsets = np.r_[0.0, running[starts[1:] - 1]]
+        values = running - offsets[codes]
+
+    return {
+        'users': users,
+        'starts': starts,
+        'codes': codes,
+        'times': times,
+        'days': days,
+        'values': values,
+        'totals': totals,
+    }
+
+def _user_colors(users):
+    # Configured user colors from user_config.json, the default color cycle otherwise
+    palette = plt.rcParams['axes.prop_cycle'].by_key()['color']
+    return [user_color(user) or palette[i % len(palette)] for i, user in enumerate(users)]
 
-def plot_cumulative_growth(week_df):
-    fig, ax = plt.subplots(figsize=(10, 6))
-    for username, group in week_df.groupby('username'):
-        group = group.sort_values('timestamp')
-        cumulative = group['daily_score'].cumsum()
-        ax.plot(group['timestamp'], cumulative, marker='o', label=username)
+def _cohort_band(series):
+    """Per-day 25th/50th/75th percentile of the users' mean value on that day."""
+    n_users = len(series['users'])
+    n_days = series['days'].max() + 1
+    sums = np.zeros((n_users, n_days))
+    counts = np.zeros((n_users, n_days))
+    np.add.at(sums, (series['codes'], series['days']), series['values'])
+    np.add.at(counts, (series['codes'], series['days']), 1)
+    logged = counts.sum(axis=0) > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        grid = sums[:, logged] / counts[:, logged]
+    low, median, high = np.nanpercentile(grid, [25, 50, 75], axis=0)
+    return np.flatnonzero(logged), low, median, high
+
+def _draw_user_lines(ax, series, x, mode, top_k, day_to_x):
+    """
+    Draw every user's line as one LineCollection and every marker as one
+    scatter, instead of one Line2D per user.
+    """
+    users = series['users']
+    splits = series['starts'][1:]
+    segments = [np.column_stack(pair) for pair in zip(np.split(x, splits), np.split(series['values'], splits))]
+    colors = _user_colors(users)
+
+    if mode == 'all':
+        highlighted = np.arange(len(users))
+    elif mode == 'topk':
+        highlighted = np.argsort(-series['totals'], kind='stable')[:top_k]
+        background = np.setdiff1d(np.arange(len(users)), highlighted)
+        if len(background):
+            ax.add_collection(LineCollection(
+                [segments[i] for i in background], colors=chart_style('topk_background_color'),
+                linewidths=chart_style('topk_background_linewidth'), alpha=chart_style('topk_background_alpha'), zorder=1
+            ))
+        band_days, low, median, high = _cohort_band(series)
+        band_x = day_to_x(band_days)
+        ax.fill_between(band_x, low, high, color=chart_style('band_color'), alpha=chart_style('band_alpha'),
+                        zorder=1, label='Cohort 25-75%')
+        ax.plot(band_x, median, color=chart_style('median_color'), linestyle='--',
+                linewidth=chart_style('median_linewidth'), zorder=2, label='Cohort median')
+    else:
+        raise ValueError(f"Unknown chart mode: {mode}")
+
+    ax.add_collection(LineCollection(
+        [segments[i] for i in highlighted], colors=[colors[i] for i in highlighted],
+        linewidths=chart_style('line_linewidth'), zorder=3
+    ))
+    point_mask = np.isin(series['codes'], highlighted)
+    point_colors = np.array(colors, dtype=object)[series['codes'][point_mask]]
+    ax.scatter(x[point_mask], series['values'][point_mask], c=list(point_colors), s=chart_style('point_size'), zorder=4)
+    ax.autoscale_view()
+    if ax.name == 'polar':
+        ax.set_rmin(0)
+
+    handles = []
+    if len(highlighted) <= MAX_LEGEND_USERS:
+        handles = [Line2D([], [], color=colors[i], marker='o', label=users[i]) for i in highlighted]
+    if mode == 'topk':
+        handles += ax.get_legend_handles_labels()[0]
+    return handles
+
+def _plot_user_facets(series, x, filename, title, ylabel, polar=False, per_page=FACETS_PER_PAGE):
+    """Small multiples: one panel per user, paginated over several figures."""
+    users = series['users']
+    splits = series['starts'][1:]
+    xs = np.split(x, splits)
+    ys = np.split(series['values'], splits)
+    colors = _user_colors(users)
+    y_max = series['values'].max() if len(series['values']) else 1
+    panel_width, panel_height = chart_style('facet_panel_figsize')
+
+    n_pages = int(np.ceil(len(users) / per_page))
+    files = []
+    for page in range(n_pages):
+        page_users = range(page * per_page, min((page + 1) * per_page, len(users)))
+        n_cols = min(FACET_COLUMNS, len(page_users))
+        n_rows = int(np.ceil(len(page_users) / n_cols))
+        fig, axes = plt.subplots(
+            n_rows, n_cols, figsize=(panel_width * n_cols, panel_height * n_rows), squeeze=False, sharex=True, sharey=True,
+            subplot_kw=dict(projection='polar') if polar else None
+        )
+        for ax in axes.flat[len(page_users):]:
+            ax.set_visible(False)
+        for ax, i in zip(axes.flat, page_users):
+            ax.plot(xs[i], ys[i], 'o-', color=colors[i], markersize=chart_style('facet_marker_size'))
+            ax.set_title(users[i], fontsize=9)
+            ax.tick_params(labelsize=7)
+            if not polar:
+                ax.xaxis.set_major_formatter(mdates.DateFormatter('%a'))
+        axes[0, 0].set_ylim(0, y_max * 1.05)
+        suffix = f" (page {page + 1}/{n_pages})" if n_pages > 1 else ""
+        fig.suptitle(title + suffix)
+        if not polar:
+            fig.supylabel(ylabel)
+        # Fixed spacing: tight_layout cost grows with the number of panels
+        fig.subplots_adjust(left=0.07, right=0.97, bottom=0.08, top=0.9, wspace=0.35, hspace=0.5)
+        page_file = _page_filename(filename, page + 1, n_pages)
+        files += save_figure(fig, page_file)
+        plt.close(fig)
+    return files
+
+def _plot_user_lines_chart(week_df, filename, title, ylabel, cumulative, mode, top_k, per_page):
+    series = _user_series(week_df, cumulative=cumulative)
+    x = mdates.date2num(series['times'])
+    if mode == 'facets':
+        return _plot_user_facets(series, x, filename, title, ylabel, per_page=per_page)
+
+    start_day = mdates.date2num(series['times'].min().astype('datetime64[D]'))
+    fig, ax = plt.subplots(figsize=chart_style('weekly_figsize'))
+    handles = _draw_user_lines(ax, series, x, mode, top_k, day_to_x=lambda d: start_day + d + 0.5)
+    ax.xaxis_date()
     ax.set_xlabel('Date')
-    ax.set_ylabel('Cumulative Score')
-    ax.set_title('Weekly Growth: Cumulative Scores per User')
-    ax.legend()
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    if handles:
+        ax.legend(handles=handles)
     plt.xticks(rotation=45)
     plt.tight_layout()
-    plt.savefig('data/weekly_cumulative_growth.png')
-    plt.close()
+    files = save_figure(fig, filename)
+    plt.close(fig)
+    return files
+
+def plot_user_growth_lines(week_df, mode='all', top_k=TOP_K_USERS, per_page=FACETS_PER_PAGE):
+    """
+    mode: 'all' draws every user, 'topk' highlights the top_k users over a
+    cohort median band, 'facets' paginates users into small multiples.
+    """
+    return _plot_user_lines_chart(
+        week_df, 'data/weekly_user_growth_lines.png', 'Weekly Growth: Daily Scores per User',
+        'Daily Score', cumulative=False, mode=mode, top_k=top_k, per_page=per_page
+    )
 
-def plot_polar_growth_comparison(week_df):
-    fig = plt.figure(figsize=(8, 8))
+def plot_cumulative_growth(week_df, mode='all', top_k=TOP_K_USERS, per_page=FACETS_PER_PAGE):
+    return _plot_user_lines_chart(
+        week_df, 'data/weekly_cumulative_growth.png', 'Weekly Growth: Cumulative Scores per User',
+        'Cumulative Score', cumulative=True, mode=mode, top_k=top_k, per_page=per_page
+    )
+
+def plot_polar_growth_comparison(week_df, mode='all', top_k=TOP_K_USERS, per_page=FACETS_PER_PAGE):
+    filename = 'data/weekly_polar_growth_comparison.png'
+    title = 'Polar Growth Comparison: Cumulative Scores Over Week'
+    series = _user_series(week_df, cumulative=True)
+    angles = (series['days'] / 7) * 2 * np.pi  # Scale to 0-2pi over 7 days
+    if mode == 'facets':
+        return _plot_user_facets(series, angles, filename, title, 'Cumulative Score', polar=True, per_page=per_page)
+
+    fig = plt.figure(figsize=chart_style('polar_figsize'))
     ax = fig.add_subplot(111, polar=True)
-    
-    # Sort the week by date
-    week_df = week_df.sort_values('timestamp')
-    start_date = week_df['timestamp'].min().date()
-    
-    for username, group in week_df.groupby('username'):
-        group = group.sort_values('timestamp')
-        group['days_since_start'] = (group['timestamp'] - pd.Timestamp(start_date)).dt.days
-        cumulative = group['daily_score'].cumsum()
-        angles = (group['days_since_start'] / 7) * 2 * np.pi  # Scale to 0-2pi over 7 days
-        ax.plot(angles, cumulative, 'o-', linewidth=2, label=username)
-    
+    handles = _draw_user_lines(ax, series, angles, mode, top_k, day_to_x=lambda d: (d / 7) * 2 * np.pi)
+
     # Set ticks for days
     day_angles = np.linspace(0, 2 * np.pi, 8, endpoint=True)  # 0 to 7 days
     ax.set_xticks(day_angles)
     ax.set_xticklabels([f'Day {i}' for i in range(8)])
-    ax.set_title('Polar Growth Comparison: Cumulative Scores Over Week', size=14, fontweight='bold', pad=20)
-    ax.legend(loc='upper right', bbox_to_anchor=(1.1, 1.1))
+    ax.set_title(title, size=14, fontweight='bold', pad=20)
+    if handles:
+        ax.legend(handles=handles, loc='upper right', bbox_to_anchor=(1.1, 1.1))
     plt.tight_layout()
-    plt.savefig('data/weekly_polar_growth_comparison.png')
-    plt.close()
+    files = save_figure(fig, filename)
+    plt.close(fig)
+    return files
 
-def plot_habit_heatmap(week_df, habit_cols):
-    # Aggregate habits by user and day
-    week_df['date'] = week_df['timestamp'].dt.date
-    habit_summary = week_df.groupby(['username', 'date'])[habit_cols].mean().unstack(level=0)
-    fig, ax = plt.subplots(figsize=(12, 8))
-    cax = ax.imshow(habit_summary.T, aspect='auto', cmap='viridis')
-    ax.set_xticks(range(len(habit_summary.index)))
-    ax.set_xticklabels([d.strftime('%a') for d in habit_summary.index], rotation=45)
-    ax.set_yticks(range(len(habit_summary.columns)))
-    ax.set_yticklabels(habit_summary.columns)
-    ax.set_title('Weekly Habit Completion Heatmap')
-    fig.colorbar(cax)
-    plt.tight_layout()
-    plt.savefig('data/weekly_habit_heatmap.png')
-    plt.close()
+# Heatmap settings
+USERS_PER_HEATMAP_PAGE = 40   # rows per heatmap page; every page has the same height
+HEATMAP_ROW_HEIGHT = 0.22     # inches per user row
+PER_HABIT_MAX_DAYS = 14       # longer spans collapse habits into one daily completion value
+# Weeks covered by the optional season heatmap, e.g. GROWTH_SEASON_WEEKS=12; unset means no season chart
+SEASON_WEEKS = int(os.environ['GROWTH_SEASON_WEEKS']) if os.environ.get('GROWTH_SEASON_WEEKS') else None
+
+def build_habit_array(df, habit_cols, start_date, n_days):
+    """
+    Dense user x day x habit array of mean habit completion, built with a
+    single scatter-add. Days with no submission are NaN.
+    """
+    dates = df['timestamp'].to_numpy().astype('datetime64[D]')
+    day_idx = ((dates - np.datetime64(start_date, 'D')) // np.timedelta64(1, 'D')).astype(int)
+    in_range = (day_idx >= 0) & (day_idx < n_days)
+    codes, users = pd.factorize(df['username'].to_numpy()[in_range], sort=True)
+    day_idx = day_idx[in_range]
+    values = df[habit_cols].to_numpy(dtype=float)[in_range]
 
-def generate_weekly_report():
+    sums = np.zeros((len(users), n_days, len(habit_cols)))
+    counts = np.zeros((len(users), n_days))
+    np.add.at(sums, (codes, day_idx), values)
+    np.add.at(counts, (codes, day_idx), 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        habits = sums / counts[..., None]
+    return np.asarray(users), habits
+
+def order_users(habits, sort_by=None):
+    """
+    Row order for the heatmap.
+      - None: alphabetical (as built)
+      - 'completion': highest overall completion first
+      - 'cluster': users with similar day/habit patterns placed next to each
+        other, ordered along the leading principal component
+    """
+    n_users = habits.shape[0]
+    if sort_by is None or n_users < 2:
+        return np.arange(n_users)
+    flat = habits.reshape(n_users, -1)
+    if sort_by == 'completion':
+        return np.argsort(-np.nanmean(flat, axis=1), kind='stable')
+    if sort_by == 'cluster':
+        filled = np.nan_to_num(flat, nan=0.0)
+        centered = filled - filled.mean(axis=0)
+        u, s, _ = np.linalg.svd(centered, full_matrices=False)
+        return np.argsort(u[:, 0] * s[0], kind='stable')
+    raise ValueError(f"Unknown heatmap sort: {sort_by}")
+
+def plot_habit_heatmap(week_df, habit_cols, start_date=None, n_days=None, sort_by=None, per_habit=None,
+                       users_per_page=USERS_PER_HEATMAP_PAGE, filename='data/weekly_habit_heatmap.png',
+                       title='Weekly Habit Completion Heatmap'):
+    """
+    One row per user. Short spans show one column per (day, habit); longer
+    spans (per_habit=False) show the mean completion of all habits per day.
+    Users are split over fixed-height pages of users_per_page rows.
+    """
+    if start_date is None:
+        start_date = week_df['timestamp'].min().date()
+    if n_days is None:
+        n_days = (week_df['timestamp'].max().date() - start_date).days + 1
+    if per_habit is None:
+        per_habit = n_days <= PER_HABIT_MAX_DAYS
+
+    users, habits = build_habit_array(week_df, habit_cols, start_date, n_days)
+    order = order_users(habits, sort_by)
+    users, habits = users[order], habits[order]
+    if per_habit:
+        matrix = habits.reshape(len(users), -1)
+        cols_per_day = len(habit_cols)
+    else:
+        # Missing days are NaN for every habit, so a plain mean keeps them NaN
+        matrix = habits.mean(axis=2)
+        cols_per_day = 1
+
+    days = np.datetime64(start_date, 'D') + np.arange(n_days)
+    if per_habit:
+        tick_days = np.arange(n_days)
+        day_format = '%a'
+    else:
+        tick_days = np.arange(0, n_days, 7)
+        day_format = '%m-%d'
+    tick_labels = [pd.Timestamp(days[d]).strftime(day_format) for d in tick_days]
+
+    cmap = plt.get_cmap(chart_style('heatmap_cmap')).copy()
+    cmap.set_bad(chart_style('heatmap_missing_color'))
+    rows = min(users_per_page, max(len(users), 1))
+    fig_height = HEATMAP_ROW_HEIGHT * rows + 2.5
+    n_pages = max(1, int(np.ceil(len(users) / users_per_page)))
+    files = []
+    for page in range(n_pages):
+        page_rows = slice(page * users_per_page, (page + 1) * users_per_page)
+        page_users = users[page_rows]
+        # Pad the last page so every page keeps the same row height
+        page_matrix = np.full((rows, matrix.shape[1]), np.nan)
+        page_matrix[:len(page_users)] = matrix[page_rows]
+
+        fig, ax = plt.subplots(figsize=(chart_style('heatmap_width'), fig_height))
+        cax = ax.imshow(page_matrix, aspect='auto', cmap=cmap, vmin=0, vmax=1, interpolation='nearest')
+        ax.set_xticks(tick_days * cols_per_day + (cols_per_day - 1) / 2)
+        ax.set_xticklabels(tick_labels, rotation=45)
+        if per_habit:
+            ax.vlines(np.arange(1, n_days) * cols_per_day - 0.5, -0.5, rows - 0.5, colors='white', linewidth=chart_style('heatmap_separator_linewidth'))
+            ax.set_xlabel(f"Day (columns per day: {', '.join(habit_cols)})")
+        else:
+            ax.set_xlabel('Date (mean completion of all habits)')
+        ax.set_yticks(range(len(page_users)))
+        ax.set_yticklabels(page_users)
+        suffix = f" (page {page + 1}/{n_pages})" if n_pages > 1 else ""
+        ax.set_title(title + suffix)
+        fig.colorbar(cax, ax=ax)
+        plt.tight_layout()
+        page_file = _page_filename(filename, page + 1, n_pages)
+        files += save_figure(fig, page_file)
+        plt.close(fig)
+    return files
+
+def plot_season_heatmap(df, habit_cols, weeks=12, sort_by='cluster'):
+    """Season-long heatmap covering the last `weeks` weeks of submissions."""
+    end_date = df['timestamp'].max().date()
+    start_date = end_date - timedelta(days=weeks * 7 - 1)
+    return plot_habit_heatmap(
+        df, habit_cols, start_date=start_date, n_days=weeks * 7, sort_by=sort_by,
+        filename='data/season_habit_heatmap.png', title=f'Habit Completion: Last {weeks} Weeks'
+    )
+
+def weekly_artifacts(week_df, habit_cols, chart_mode='all', df=None, season_weeks=None, heatmap_sort=None):
+    """
+    Dependency graph of the weekly report: the league feeds two charts, the
+    rest only need the week. heatmap_sort orders the heatmap rows (None for
+    alphabetical, 'completion' or 'cluster'). With season_weeks (and the full
+    df) a season heatmap over that many weeks is added.
+    """
+    charts = [
+        ('average_scores', plot_weekly_average_scores, (), {}, ('league',)),
+        ('league_table', plot_weekly_table, (), {}, ('league',)),
+        ('growth_lines', plot_user_growth_lines, (week_df,), {'mode': chart_mode}, ()),
+        ('cumulative_growth', plot_cumulative_growth, (week_df,), {'mode': chart_mode}, ()),
+        ('habit_heatmap', plot_habit_heatmap, (week_df, habit_cols), {'sort_by': heatmap_sort}, ()),
+        ('polar_comparison', plot_polar_growth_comparison, (week_df,), {'mode': chart_mode}, ()),
+    ]
+    if season_weeks and df is not None:
+        season_kwargs = {'weeks': season_weeks}
+        if heatmap_sort:
+            season_kwargs['sort_by'] = heatmap_sort   # otherwise the season view keeps its 'cluster' default
+        charts.append(('season_heatmap', plot_season_heatmap, (df, habit_cols), season_kwargs, ()))
+    # Changing the image output profiles or chart styles must re-render charts even when the data is unchanged
+    config = load_user_config()
+    version = (ACTIVE_PROFILES, sorted(config['users'].items()), sorted(config['charts'].items()))
+    return [Artifact('league', generate_weekly_league, args=(week_df,), writes_files=False)] + [
+        Artifact(name, func, args=args, kwargs=kwargs, deps=deps, version=version)
+        for name, func, args, kwargs, deps in charts
+    ]
+
+def generate_weekly_report(chart_mode='all', max_workers=None, force=False, season_weeks=SEASON_WEEKS,
+                           heatmap_sort=None):
     df, habit_cols = load_and_process_csv()
     week_df, start, end = get_current_week_df(df)
     if week_df.empty:
         print("❌ No data for this week")
         return
     
+    os.makedirs('data', exist_ok=True)
     league = generate_weekly_league(week_df)
     
-    # Generate all visualizations
-    plot_weekly_average_scores(league)
-    plot_weekly_table(league)
-    plot_user_growth_lines(week_df)
-    plot_cumulative_growth(week_df)
-    plot_habit_heatmap(week_df, habit_cols)
-    plot_polar_growth_comparison(week_df)
+    # Generate all visualizations (independent charts run concurrently, unchanged ones are skipped)
+    artifacts = weekly_artifacts(week_df, habit_cols, chart_mode, df=df, season_weeks=season_weeks,
+                                 heatmap_sort=heatmap_sort)
+    report = run_artifacts(artifacts, max_workers=max_workers, force=force)
     
     print(f"\n🏆 WEEKLY LEAGUE TABLE ({start.date()} to {end.date()})\n")
     print(league.round(2))
+    print_artifact_report(report)
     print("\n✅ Weekly visualizations saved to data/")
 
 if __name__ == "__main__":
-    generate_weekly_report()
+    parser = argparse.ArgumentParser(description="Generate the weekly league and charts")
+    parser.add_argument('--chart-mode', choices=['all', 'topk', 'facets'], default='all')
+    parser.add_argument('--season-weeks', type=int, default=SEASON_WEEKS,
+                        help="also draw a habit heatmap over the last N weeks")
+    parser.add_argument('--heatmap-sort', choices=['completion', 'cluster'], default=None,
+                        help="order heatmap rows by completion rate or by similar habit patterns")
+    parser.add_argument('--force', action='store_true', help="re-render charts even if unchanged")
+    args = parser.parse_args()
+    generate_weekly_report(chart_mode=args.chart_mode, force=args.force, season_weeks=args.season_weeks,
+                           heatmap_sort=args.heatmap_sort)
 